@@ -1,16 +1,23 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.database import init_db
 from app.routers import expenses
+from app.services.classifier import keep_ollama_warm
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    # Warm up in the background so startup is not blocked by the model load
+    keep_warm_task = asyncio.create_task(keep_ollama_warm())
     yield
+    keep_warm_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await keep_warm_task
 
 
 app = FastAPI(
@@ -26,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
@@ -2,7 +2,7 @@ from datetime import date
 from typing import Annotated
 
 import pandas as pd
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile
 from sqlalchemy import select, func, extract
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +14,7 @@ from app.schemas.expense import (
     ImportResponse,
     KPIResponse,
 )
+from app.services.cache import response_cache
 from app.services.classifier import classify_with_ai
 from app.services.column_detector import detect_columns
 from app.services.parsers import parse_file
@@ -91,6 +92,7 @@ async def import_expenses(
         expenses.append(expense)
 
     await db.commit()
+    response_cache.bump_version()
 
     for expense in expenses:
         await db.refresh(expense)
@@ -109,8 +111,21 @@ async def list_expenses(
     category: str | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """List expenses with optional filters."""
+    cache_key = response_cache.make_key(
+        "list_expenses",
+        skip=skip,
+        limit=limit,
+        category=category,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    cached = response_cache.get(cache_key, if_none_match)
+    if cached is not None:
+        return cached
+
     query = select(Expense).order_by(Expense.date.desc())
 
     if category:
@@ -123,7 +138,10 @@ async def list_expenses(
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
 
-    return [ExpenseResponse.model_validate(e) for e in result.scalars().all()]
+    return response_cache.set(
+        cache_key,
+        [ExpenseResponse.model_validate(e) for e in result.scalars().all()],
+    )
 
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
@@ -166,6 +184,7 @@ async def update_expense(
         expense.subcategory = update.subcategory
 
     await db.commit()
+    response_cache.bump_version()
     await db.refresh(expense)
 
     return ExpenseResponse.model_validate(expense)
@@ -176,8 +195,14 @@ async def get_kpis(
     db: AsyncSession = Depends(get_db),
     year: int | None = None,
     month: int | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
     """Get expense KPIs for a given period."""
+    cache_key = response_cache.make_key("get_kpis", year=year, month=month)
+    cached = response_cache.get(cache_key, if_none_match)
+    if cached is not None:
+        return cached
+
     query = select(Expense).where(Expense.amount < 0)  # Only expenses, not income
 
     if year:
@@ -200,11 +225,14 @@ async def get_kpis(
         key = e.date.strftime("%Y-%m")
         by_month[key] = by_month.get(key, 0) + abs(e.amount)
 
-    return KPIResponse(
-        total=round(total, 2),
-        by_category={k: round(v, 2) for k, v in sorted(by_category.items())},
-        by_month={k: round(v, 2) for k, v in sorted(by_month.items())},
-        count=len(expenses),
+    return response_cache.set(
+        cache_key,
+        KPIResponse(
+            total=round(total, 2),
+            by_category={k: round(v, 2) for k, v in sorted(by_category.items())},
+            by_month={k: round(v, 2) for k, v in sorted(by_month.items())},
+            count=len(expenses),
+        ),
     )
 
 
@@ -222,5 +250,6 @@ async def delete_expense(
 
     await db.delete(expense)
     await db.commit()
+    response_cache.bump_version()
 
     return {"deleted": expense_id}
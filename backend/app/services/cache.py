@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """In-process LRU cache for read endpoints, invalidated by a data version.
+
+    The version lives in memory, so the cache is only valid with a single
+    worker process (the default uvicorn setup).
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.version = 0
+        # Keeps ETags from a previous process from matching after a restart
+        self._instance = uuid.uuid4().hex
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def bump_version(self) -> None:
+        """Invalidate every cached response after a data change."""
+        self.version += 1
+        self._entries.clear()
+
+    def make_key(self, endpoint: str, **params) -> str:
+        """Build a cache key from the endpoint, its parameters and the data version."""
+        params_text = json.dumps(jsonable_encoder(params), sort_keys=True)
+        return f"{self.version}:{endpoint}:{params_text}"
+
+    def make_etag(self, key: str) -> str:
+        digest = hashlib.sha1(f"{self._instance}:{key}".encode()).hexdigest()[:16]
+        return f'W/"{digest}"'
+
+    def get(self, key: str, if_none_match: str | None = None) -> Response | None:
+        """Return a cached (or 304) response for the key, if available."""
+        etag = self.make_etag(key)
+        if if_none_match and _etag_matches(etag, if_none_match):
+            return Response(status_code=304, headers=_cache_headers(etag))
+
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        self._entries.move_to_end(key)
+        return _json_response(cached)
+
+    def set(self, key: str, content) -> Response:
+        """Store the serialized content and return it as a response."""
+        cached = CachedResponse(
+            body=json.dumps(jsonable_encoder(content)).encode(),
+            etag=self.make_etag(key),
+        )
+        # Data may have changed while the query was running
+        if key.startswith(f"{self.version}:"):
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return _json_response(cached)
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _json_response(cached: CachedResponse) -> Response:
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers=_cache_headers(cached.etag),
+    )
+
+
+response_cache = ResponseCache(int(os.getenv("RESPONSE_CACHE_SIZE", "128")))
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import re
@@ -17,20 +18,27 @@ CATEGORIES = {
     "Otros": ["Sin categoría"],
 }
 
-CLASSIFICATION_PROMPT = """Eres un clasificador de gastos bancarios. Analiza la descripción del movimiento y devuelve la categoría y subcategoría más apropiada.
+# Static instructions sent as the system prompt. Keeping them identical across
+# requests lets the model runtime reuse the cached prefix.
+SYSTEM_PROMPT = """Eres un clasificador de gastos bancarios. Analiza la descripción del movimiento y devuelve la categoría y subcategoría más apropiada.
 
 Categorías disponibles:
 {categories}
 
-Correcciones previas del usuario (usa estas como referencia prioritaria):
+Si se incluyen correcciones previas del usuario, úsalas como referencia prioritaria.
+
+Responde SOLO con un JSON válido:
+{{"category": "Categoría", "subcategory": "Subcategoría"}}
+""".format(
+    categories="\n".join(f"- {cat}: {', '.join(subs)}" for cat, subs in CATEGORIES.items())
+)
+
+CLASSIFICATION_PROMPT = """Correcciones previas del usuario:
 {corrections}
 
 Movimiento a clasificar:
 Descripción: {description}
 Importe: {amount}€
-
-Responde SOLO con un JSON válido:
-{{"category": "Categoría", "subcategory": "Subcategoría"}}
 """
 
 
@@ -65,17 +73,12 @@ async def classify_with_ai(
     if provider == "fallback":
         return _fallback_classification(description, amount)
 
-    categories_text = "\n".join(
-        f"- {cat}: {', '.join(subs)}" for cat, subs in CATEGORIES.items()
-    )
-
     corrections_text = "Ninguna" if not corrections else "\n".join(
         f"- '{c['pattern']}' → {c['category']}/{c.get('subcategory', '')}"
         for c in corrections[:10]
     )
 
     prompt = CLASSIFICATION_PROMPT.format(
-        categories=categories_text,
         corrections=corrections_text,
         description=description,
         amount=amount,
@@ -93,18 +96,27 @@ async def classify_with_ai(
         return _fallback_classification(description, amount)
 
 
-async def _classify_ollama(prompt: str) -> Classification:
-    """Classify using Ollama (local LLM)."""
+def _ollama_settings() -> tuple[str, str, str]:
+    """Return Ollama host, model and keep_alive duration."""
     host = os.getenv("OLLAMA_HOST", "http://ollama:11434")
     model = os.getenv("OLLAMA_MODEL", "llama3.2")
+    keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    return host, model, keep_alive
+
+
+async def _classify_ollama(prompt: str) -> Classification:
+    """Classify using Ollama (local LLM)."""
+    host, model, keep_alive = _ollama_settings()
 
     async with httpx.AsyncClient() as client:
         response = await client.post(
             f"{host}/api/generate",
             json={
                 "model": model,
+                "system": SYSTEM_PROMPT,
                 "prompt": prompt,
                 "stream": False,
+                "keep_alive": keep_alive,
                 "options": {"temperature": 0},
             },
             timeout=60,
@@ -114,6 +126,43 @@ async def _classify_ollama(prompt: str) -> Classification:
         return _parse_json_response(content)
 
 
+async def warm_up_ollama() -> None:
+    """Load the Ollama model and prime the cached system prompt prefix."""
+    host, model, keep_alive = _ollama_settings()
+
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{host}/api/generate",
+            json={
+                "model": model,
+                "system": SYSTEM_PROMPT,
+                "prompt": "OK",
+                "stream": False,
+                "keep_alive": keep_alive,
+                "options": {"temperature": 0, "num_predict": 1},
+            },
+            # Loading the model from disk can take minutes on CPU-only hosts
+            timeout=int(os.getenv("OLLAMA_WARMUP_TIMEOUT", "600")),
+        )
+        response.raise_for_status()
+
+
+async def keep_ollama_warm() -> None:
+    """Warm up Ollama and then refresh it periodically so it is never unloaded."""
+    if _get_provider() != "ollama":
+        return
+
+    interval = int(os.getenv("OLLAMA_KEEP_WARM_INTERVAL", "300"))
+    while True:
+        try:
+            await warm_up_ollama()
+        except Exception as e:
+            print(f"Ollama warm-up error: {e}")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
 async def _classify_openai(prompt: str) -> Classification:
     """Classify using OpenAI API."""
     api_key = os.getenv("OPENAI_API_KEY")
@@ -123,7 +172,10 @@ async def _classify_openai(prompt: str) -> Classification:
             headers={"Authorization": f"Bearer {api_key}"},
             json={
                 "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
                 "temperature": 0,
             },
             timeout=30,
@@ -146,6 +198,7 @@ async def _classify_anthropic(prompt: str) -> Classification:
             json={
                 "model": "claude-3-haiku-20240307",
                 "max_tokens": 100,
+                "system": SYSTEM_PROMPT,
                 "messages": [{"role": "user", "content": prompt}],
             },
             timeout=30,
@@ -0,0 +1,266 @@
+"""Concurrent load test for the backend with a fake Ollama provider.
+
+Runs the FastAPI app in-process against a temporary SQLite database and drives
+it with mixed traffic (imports, listings, KPIs and corrections) from a number
+of simulated users. A fake `/api/generate` server with configurable latency and
+error rate stands in for the LLM.
+
+Usage:
+    python scripts/loadtest.py --users 20 --duration 60
+    python scripts/loadtest.py --users 50 --llm-latency 0.5 --llm-error-rate 0.1
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+
+DESCRIPTIONS = [
+    ("MERCADONA SUPERMERCADOS", -45.32),
+    ("REPSOL GASOLINERA", -60.00),
+    ("TRANSFERENCIA NOMINA", 2500.00),
+    ("NETFLIX MENSUAL", -12.99),
+    ("FARMACIA CENTRAL", -8.50),
+    ("IBERDROLA FACTURA LUZ", -75.20),
+    ("RESTAURANTE LA TASCA", -32.00),
+    ("AMAZON MARKETPLACE", -24.99),
+    ("RENFE CERCANIAS", -10.40),
+    ("BAR CAFETERIA SOL", -3.20),
+]
+
+FAKE_CLASSIFICATIONS = [
+    {"category": "Alimentación", "subcategory": "Supermercado"},
+    {"category": "Transporte", "subcategory": "Combustible"},
+    {"category": "Ocio", "subcategory": "Suscripciones"},
+    {"category": "Hogar", "subcategory": "Suministros"},
+    {"category": "Otros", "subcategory": "Sin categoría"},
+]
+
+
+@dataclass
+class ProviderStats:
+    requests: int = 0
+    errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def create_fake_provider(latency: float, jitter: float, error_rate: float, stats: ProviderStats) -> FastAPI:
+    """Build a fake Ollama server answering `/api/generate`."""
+    provider = FastAPI()
+
+    @provider.post("/api/generate")
+    async def generate(payload: dict):
+        with stats.lock:
+            stats.requests += 1
+        await asyncio.sleep(max(0.0, random.gauss(latency, jitter)))
+        if random.random() < error_rate:
+            with stats.lock:
+                stats.errors += 1
+            raise HTTPException(500, "Simulated provider error")
+        return {
+            "model": payload.get("model"),
+            "response": json.dumps(random.choice(FAKE_CLASSIFICATIONS)),
+            "done": True,
+        }
+
+    return provider
+
+
+def start_fake_provider(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run the fake provider in its own thread so it does not share the app's event loop."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def generate_statement(rows: int) -> bytes:
+    """Generate a bank statement CSV like docs/ejemplo_gastos.csv."""
+    start = date(2024, 1, 1)
+    lines = ["Fecha;Concepto;Importe"]
+    for _ in range(rows):
+        description, amount = random.choice(DESCRIPTIONS)
+        day = start + timedelta(days=random.randint(0, 364))
+        amount = round(amount * random.uniform(0.5, 1.5), 2)
+        lines.append(f"{day:%d/%m/%Y};{description} {random.randint(1, 999)};{amount}")
+    return "\n".join(lines).encode()
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    locks: int = 0
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.stats: dict[str, EndpointStats] = {}
+        self.expense_ids: list[int] = []
+        self.loop_lags: list[float] = []
+
+    async def run_user(self, deadline: float) -> None:
+        operations = [self.import_expenses, self.list_expenses, self.get_kpis, self.update_expense]
+        weights = [self.args.import_weight, self.args.list_weight, self.args.kpis_weight, self.args.update_weight]
+        while time.perf_counter() < deadline:
+            operation = random.choices(operations, weights)[0]
+            await operation()
+            await asyncio.sleep(random.uniform(0, self.args.think_time))
+
+    async def monitor_loop_lag(self, deadline: float, interval: float = 0.05) -> None:
+        """Measure how late the event loop wakes up a sleeping task."""
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lags.append(time.perf_counter() - start - interval)
+
+    async def _request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        stats = self.stats.setdefault(name, EndpointStats())
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception as e:
+            # Unhandled app errors propagate through the ASGI transport
+            stats.latencies.append(time.perf_counter() - start)
+            stats.errors += 1
+            if "database is locked" in str(e):
+                stats.locks += 1
+            return None
+        stats.latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            stats.errors += 1
+            if "database is locked" in response.text:
+                stats.locks += 1
+            return None
+        return response
+
+    async def import_expenses(self) -> None:
+        content = generate_statement(self.args.import_rows)
+        response = await self._request(
+            "import_expenses", "POST", "/expenses/import",
+            files={"file": ("extracto.csv", io.BytesIO(content), "text/csv")},
+        )
+        if response is not None:
+            self.expense_ids.extend(e["id"] for e in response.json()["expenses"])
+
+    async def list_expenses(self) -> None:
+        skip = random.randint(0, max(0, len(self.expense_ids) - 100))
+        await self._request("list_expenses", "GET", "/expenses", params={"skip": skip, "limit": 100})
+
+    async def get_kpis(self) -> None:
+        params = {"year": 2024}
+        if random.random() < 0.5:
+            params["month"] = random.randint(1, 12)
+        await self._request("get_kpis", "GET", "/expenses/kpis", params=params)
+
+    async def update_expense(self) -> None:
+        if not self.expense_ids:
+            return
+        category = random.choice(FAKE_CLASSIFICATIONS)
+        await self._request(
+            "update_expense", "PUT", f"/expenses/{random.choice(self.expense_ids)}", json=category,
+        )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_report(test: LoadTest, elapsed: float, provider_stats: ProviderStats | None) -> None:
+    total = sum(len(s.latencies) for s in test.stats.values())
+    print(f"\nDuration: {elapsed:.1f}s  Requests: {total}  Throughput: {total / elapsed:.1f} req/s")
+    print(f"\n{'Endpoint':<18}{'Count':>7}{'Errors':>8}{'Locks':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, stats in sorted(test.stats.items()):
+        ms = [v * 1000 for v in stats.latencies]
+        print(
+            f"{name:<18}{len(ms):>7}{stats.errors:>8}{stats.locks:>7}"
+            f"{percentile(ms, 50):>9.1f}{percentile(ms, 95):>9.1f}"
+            f"{percentile(ms, 99):>9.1f}{max(ms, default=0):>9.1f}"
+        )
+
+    lags = [v * 1000 for v in test.loop_lags]
+    print(
+        f"\nEvent loop lag: p50={percentile(lags, 50):.1f}ms p99={percentile(lags, 99):.1f}ms "
+        f"max={max(lags, default=0):.1f}ms"
+    )
+    if provider_stats is not None:
+        # Provider errors are hidden from the API by the fallback classifier
+        print(f"Fake provider: {provider_stats.requests} requests, {provider_stats.errors} injected errors")
+
+
+async def run(args: argparse.Namespace, provider_stats: ProviderStats | None) -> None:
+    # Imported here so OLLAMA_HOST and the working directory are already set
+    from app.database import init_db
+    from app.main import app
+
+    await init_db()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        test = LoadTest(client, args)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            test.monitor_loop_lag(deadline),
+            *(test.run_user(deadline) for _ in range(args.users)),
+        )
+        print_report(test, time.perf_counter() - start, provider_stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--think-time", type=float, default=0.1, help="Max pause between requests per user")
+    parser.add_argument("--import-rows", type=int, default=20, help="Rows per generated statement")
+    parser.add_argument("--import-weight", type=float, default=1)
+    parser.add_argument("--list-weight", type=float, default=5)
+    parser.add_argument("--kpis-weight", type=float, default=5)
+    parser.add_argument("--update-weight", type=float, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mean fake LLM latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.05, help="Std deviation of the fake LLM latency")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of fake LLM requests that fail")
+    parser.add_argument("--provider-port", type=int, default=11435)
+    parser.add_argument("--ollama-host", help="Use an existing provider instead of the fake one")
+    args = parser.parse_args()
+
+    provider_stats = None
+    if args.ollama_host:
+        os.environ["OLLAMA_HOST"] = args.ollama_host
+    else:
+        provider_stats = ProviderStats()
+        provider = create_fake_provider(args.llm_latency, args.llm_jitter, args.llm_error_rate, provider_stats)
+        start_fake_provider(provider, args.provider_port)
+        os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{args.provider_port}"
+    os.environ["USE_AI"] = "true"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # The app stores its SQLite database under ./data
+        os.chdir(workdir)
+        asyncio.run(run(args, provider_stats))
+
+
+if __name__ == "__main__":
+    main()